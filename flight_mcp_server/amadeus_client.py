@@ -1,59 +1,374 @@
 """Amadeus API client for flight queries."""
 
+import asyncio
+import functools
 import os
 import logging
-from typing import Dict, List, Optional, Any
-from amadeus import Client, ResponseError
+import re
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Any
+from amadeus import Client, NetworkError, ResponseError, ServerError
+from amadeus.client.access_token import AccessToken
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from .cache import TTLCache
+from .error_handler import FlightAPIError
 
 logger = logging.getLogger(__name__)
 
+# Flight offers are price-sensitive, so keep them only briefly; airport
+# reference data barely changes and can live for the whole process.
+SEARCH_CACHE_TTL = 120
+SEARCH_CACHE_SIZE = 512
+AIRPORT_CACHE_SIZE = 4096
+
+# Number of flight offers returned per search
+MAX_FLIGHT_OFFERS = 5
+
+# The Amadeus SDK is synchronous, so its calls run on a worker pool sized to
+# the test environment's 10 requests/second quota.
+MAX_CONCURRENT_CALLS = 10
+
+# Shared by every service instance so the quota applies process-wide
+_pool = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_CALLS,
+    thread_name_prefix="amadeus"
+)
+
+# Seconds a call may wait for a free worker, and then seconds Amadeus has to
+# answer once a worker starts it; the latter also bounds each HTTP request so
+# hung sockets release their worker. Flight offer searches on the test
+# environment routinely take several seconds, so a tighter budget would trip
+# the circuit breaker on healthy responses.
+REQUEST_TIMEOUT = 10
+# Consecutive outage-type failures that open the circuit, and how long it stays open
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30
+
+# Shared read-only stand-in for missing nested objects in API payloads
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+_DURATION_RE = re.compile(r'^PT(?:(\d+)H)?(?:(\d+)M)?$')
+
+_TRAVEL_CLASS_MAP: Mapping[str, str] = MappingProxyType({
+    'economy': 'ECONOMY',
+    'premium_economy': 'PREMIUM_ECONOMY',
+    'business': 'BUSINESS',
+    'first': 'FIRST'
+})
+
+# Common carriers by IATA code; anything else falls back to "Airline XX"
+_AIRLINE_NAMES = {
+    '6E': 'IndiGo',
+    'AA': 'American Airlines',
+    'AC': 'Air Canada',
+    'AF': 'Air France',
+    'AI': 'Air India',
+    'AM': 'Aeromexico',
+    'AR': 'Aerolineas Argentinas',
+    'AS': 'Alaska Airlines',
+    'AV': 'Avianca',
+    'AY': 'Finnair',
+    'AZ': 'ITA Airways',
+    'B6': 'JetBlue Airways',
+    'BA': 'British Airways',
+    'BR': 'EVA Air',
+    'CA': 'Air China',
+    'CI': 'China Airlines',
+    'CM': 'Copa Airlines',
+    'CX': 'Cathay Pacific',
+    'CZ': 'China Southern Airlines',
+    'DL': 'Delta Air Lines',
+    'DY': 'Norwegian Air Shuttle',
+    'EI': 'Aer Lingus',
+    'EK': 'Emirates',
+    'ET': 'Ethiopian Airlines',
+    'EW': 'Eurowings',
+    'EY': 'Etihad Airways',
+    'F9': 'Frontier Airlines',
+    'FR': 'Ryanair',
+    'G3': 'Gol Linhas Aereas',
+    'HA': 'Hawaiian Airlines',
+    'IB': 'Iberia',
+    'JL': 'Japan Airlines',
+    'KE': 'Korean Air',
+    'KL': 'KLM',
+    'LA': 'LATAM Airlines',
+    'LH': 'Lufthansa',
+    'LO': 'LOT Polish Airlines',
+    'LX': 'Swiss International Air Lines',
+    'MH': 'Malaysia Airlines',
+    'MS': 'EgyptAir',
+    'MU': 'China Eastern Airlines',
+    'NH': 'All Nippon Airways',
+    'NK': 'Spirit Airlines',
+    'NZ': 'Air New Zealand',
+    'OS': 'Austrian Airlines',
+    'OZ': 'Asiana Airlines',
+    'PR': 'Philippine Airlines',
+    'QF': 'Qantas',
+    'QR': 'Qatar Airways',
+    'SA': 'South African Airways',
+    'SK': 'SAS Scandinavian Airlines',
+    'SN': 'Brussels Airlines',
+    'SQ': 'Singapore Airlines',
+    'SV': 'Saudia',
+    'TG': 'Thai Airways',
+    'TK': 'Turkish Airlines',
+    'TP': 'TAP Air Portugal',
+    'U2': 'easyJet',
+    'UA': 'United Airlines',
+    'VA': 'Virgin Australia',
+    'VS': 'Virgin Atlantic',
+    'VY': 'Vueling',
+    'W6': 'Wizz Air',
+    'WN': 'Southwest Airlines',
+    'WS': 'WestJet'
+}
+
+
+class _SharedAccessToken(AccessToken):
+    """OAuth2 token that refreshes early and only once across worker threads."""
+
+    TOKEN_BUFFER = 30
+
+    def __init__(self, client: Client):
+        super().__init__(client)
+        self._lock = threading.Lock()
+
+    def _bearer_token(self) -> str:
+        with self._lock:
+            return super()._bearer_token()
+
+    def needs_refresh(self) -> bool:
+        """Return True if the next API call would have to fetch a new token."""
+        return self.access_token is None or int(time.time()) + self.TOKEN_BUFFER >= self.expires_at
+
+
+class _CircuitBreaker:
+    """Fail fast while Amadeus is down, letting one probe through after a cool-down."""
+
+    __slots__ = ("failure_threshold", "reset_timeout", "_failures", "_open_until", "_probing")
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being rejected without reaching Amadeus."""
+        return self._failures >= self.failure_threshold and (
+            self._probing or time.monotonic() < self._open_until
+        )
+
+    def before_call(self) -> None:
+        """Raise FlightAPIError instead of calling out while the circuit is open."""
+        if self._failures < self.failure_threshold:
+            return
+        if self.is_open:
+            raise FlightAPIError("Flight data provider is temporarily unavailable, please try again shortly")
+        # Half-open: this call is the single probe
+        self._probing = True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self._failures >= self.failure_threshold:
+            self._open_until = time.monotonic() + self.reset_timeout
+            logger.warning(f"Amadeus circuit open for {self.reset_timeout}s after {self._failures} failures")
+
+    def release(self) -> None:
+        """End a call whose outcome says nothing about upstream health."""
+        self._probing = False
+
+
+_breaker = _CircuitBreaker(FAILURE_THRESHOLD, RESET_TIMEOUT)
+
+
+@functools.cache
+def _settings() -> Dict[str, str]:
+    """Load environment variables once and return the Amadeus credentials.
+
+    Missing credentials raise instead of returning, so the failure is not
+    cached and a later call can pick up a fixed environment.
+    """
+    load_dotenv()
+    api_key = os.getenv("AMADEUS_API_KEY")
+    api_secret = os.getenv("AMADEUS_API_SECRET")
+    if not api_key or not api_secret:
+        raise ValueError("Amadeus API credentials not found in environment variables")
+    return {
+        'api_key': api_key,
+        'api_secret': api_secret
+    }
+
+
+@functools.cache
+def _get_client(api_key: str, api_secret: str) -> Client:
+    """Return the process-wide Amadeus client for the given credentials."""
+    client = Client(
+        client_id=api_key,
+        client_secret=api_secret,
+        http=functools.partial(urllib.request.urlopen, timeout=REQUEST_TIMEOUT)
+    )
+    # The SDK memoizes its token on this attribute; install ours up front
+    client.access_token = _SharedAccessToken(client)
+    return client
+
+
+def _mark_started(started: "asyncio.Future[None]") -> None:
+    """Signal from the event loop that a worker has picked up a call."""
+    if not started.done():
+        started.set_result(None)
+
 
 class AmadeusFlightService:
     """Service for interacting with Amadeus API."""
     
+    __slots__ = ("api_key", "api_secret", "amadeus", "_search_cache", "_airport_cache")
+    
     def __init__(self):
         """Initialize Amadeus client."""
-        self.api_key = os.getenv("AMADEUS_API_KEY")
-        self.api_secret = os.getenv("AMADEUS_API_SECRET")
-        
-        if not self.api_key or not self.api_secret:
-            raise ValueError("Amadeus API credentials not found in environment variables")
+        settings = _settings()
+        self.api_key = settings['api_key']
+        self.api_secret = settings['api_secret']
         
-        self.amadeus = Client(
-            client_id=self.api_key,
-            client_secret=self.api_secret
-        )
+        self.amadeus = _get_client(self.api_key, self.api_secret)
+        self._search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+        self._airport_cache = TTLCache(maxsize=AIRPORT_CACHE_SIZE)
         logger.info("Amadeus client initialized successfully")
     
-    async def search_flights(self, search_params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def token_needs_refresh(self) -> bool:
+        """Return True if the OAuth2 access token is missing or about to expire."""
+        return self.amadeus.access_token.needs_refresh()
+    
+    def has_cached_search(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str] = None,
+        adults: int = 1,
+        travel_class: str = 'economy'
+    ) -> bool:
+        """Return True if search_flights would be served from cache."""
+        key = self._search_key(origin, destination, departure_date, return_date, adults, travel_class)
+        return key in self._search_cache
+    
+    async def ensure_token(self) -> None:
+        """Fetch or refresh the OAuth2 access token ahead of an API call.
+
+        This is a best-effort warm-up that bypasses the circuit breaker: any
+        failure is logged and the next API call fetches the token itself
+        through _call, where the error is reported and outages are counted.
+        """
+        token = self.amadeus.access_token
+        if not token.needs_refresh() or _breaker.is_open:
+            return
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(loop.run_in_executor(_pool, token._bearer_token), REQUEST_TIMEOUT)
+        # ResponseError covers auth and client errors; OSError covers socket
+        # timeouts, which are not asyncio.TimeoutError before Python 3.11
+        except (asyncio.TimeoutError, ResponseError, OSError) as error:
+            logger.warning(f"Amadeus token refresh failed: {error!r}")
+    
+    async def search_flights(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str] = None,
+        adults: int = 1,
+        travel_class: str = 'economy'
+    ) -> List[Dict[str, Any]]:
+        """Search for flights using Amadeus API, serving repeats from cache."""
+        key = self._search_key(origin, destination, departure_date, return_date, adults, travel_class)
+        # Empty results are not cached so a retry can pick up new availability
+        return await self._search_cache.get_or_fetch(
+            key, lambda: self._fetch_flights(*key), should_cache=bool
+        )
+    
+    @staticmethod
+    def _search_key(
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str],
+        adults: int,
+        travel_class: str
+    ) -> tuple:
+        """Build the search cache key; its order matches _fetch_flights' arguments."""
+        return (origin, destination, departure_date, return_date, adults, travel_class)
+    
+    async def get_airport_info(self, airport_code: str) -> Dict[str, Any]:
+        """Get airport information from Amadeus API, serving repeats from cache."""
+        airport_code = airport_code.upper()
+        return await self._airport_cache.get_or_fetch(
+            airport_code, lambda: self._fetch_airport_info(airport_code)
+        )
+    
+    async def get_airports_info(self, airport_codes: List[str]) -> List[Any]:
+        """Get information for several airports concurrently.
+
+        Results follow the order of airport_codes; a failed lookup yields its
+        exception in place of the airport dict.
+        """
+        return await asyncio.gather(
+            *(self.get_airport_info(code) for code in airport_codes),
+            return_exceptions=True
+        )
+
+    async def _fetch_flights(
+        self,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        return_date: Optional[str],
+        adults: int,
+        travel_class: str
+    ) -> List[Dict[str, Any]]:
         """Search for flights using Amadeus API."""
         try:
             # Prepare search parameters
             params = {
-                'originLocationCode': search_params['origin'],
-                'destinationLocationCode': search_params['destination'],
-                'departureDate': search_params['departure_date'],
-                'adults': search_params['adults'],
-                'travelClass': self._map_travel_class(search_params['travel_class'])
+                'originLocationCode': origin,
+                'destinationLocationCode': destination,
+                'departureDate': departure_date,
+                'adults': adults,
+                'travelClass': self._map_travel_class(travel_class),
+                # Let Amadeus trim the result set instead of slicing it here
+                'max': MAX_FLIGHT_OFFERS
             }
             
-            if search_params.get('return_date'):
-                params['returnDate'] = search_params['return_date']
+            if return_date:
+                params['returnDate'] = return_date
             
             # Search flights
-            response = self.amadeus.shopping.flight_offers_search.get(**params)
+            response = await self._call(self.amadeus.shopping.flight_offers_search.get, **params)
             
             if not response.data:
                 return []
             
             # Transform Amadeus response to our format
+            transform = self._transform_flight_offer
+            
             flights = []
-            for offer in response.data[:5]:  # Limit to 5 results
-                flight_data = self._transform_flight_offer(offer, search_params)
+            for offer in response.data[:MAX_FLIGHT_OFFERS]:
+                flight_data = transform(
+                    offer, origin, destination, departure_date, adults, travel_class
+                )
                 if flight_data:
                     flights.append(flight_data)
             
@@ -66,12 +381,14 @@ class AmadeusFlightService:
             logger.error(f"Unexpected error in flight search: {error}")
             raise
     
-    async def get_airport_info(self, airport_code: str) -> Dict[str, Any]:
+    async def _fetch_airport_info(self, airport_code: str) -> Dict[str, Any]:
         """Get airport information from Amadeus API."""
         try:
-            response = self.amadeus.reference_data.locations.get(
+            response = await self._call(
+                self.amadeus.reference_data.locations.get,
                 keyword=airport_code,
-                subType='AIRPORT'
+                subType='AIRPORT',
+                page={'limit': 1}
             )
             
             if not response.data:
@@ -98,59 +415,96 @@ class AmadeusFlightService:
             logger.error(f"Unexpected error getting airport info: {error}")
             raise
     
+    async def _call(self, func: Any, **params: Any) -> Any:
+        """Run a blocking SDK call on the worker pool without stalling the event loop."""
+        _breaker.before_call()
+        loop = asyncio.get_running_loop()
+        started = loop.create_future()
+        
+        def run() -> Any:
+            loop.call_soon_threadsafe(_mark_started, started)
+            return func(**params)
+        
+        future = loop.run_in_executor(_pool, run)
+        try:
+            # A backlog on our own pool says nothing about Amadeus, so queue
+            # time gets its own deadline and never counts as a failure
+            await asyncio.wait_for(started, timeout=REQUEST_TIMEOUT)
+        except asyncio.TimeoutError as error:
+            future.cancel()
+            _breaker.release()
+            raise FlightAPIError("Flight data provider is busy, please try again shortly") from error
+        except BaseException:
+            future.cancel()
+            _breaker.release()
+            raise
+        try:
+            response = await asyncio.wait_for(future, timeout=REQUEST_TIMEOUT)
+        except asyncio.TimeoutError as error:
+            _breaker.record_failure()
+            raise FlightAPIError("Flight data provider did not respond in time") from error
+        except (NetworkError, ServerError):
+            _breaker.record_failure()
+            raise
+        except BaseException:
+            # Client errors and cancellations are not outage signals
+            _breaker.release()
+            raise
+        _breaker.record_success()
+        return response
+    
     def _map_travel_class(self, travel_class: str) -> str:
         """Map our travel class to Amadeus travel class."""
-        mapping = {
-            'economy': 'ECONOMY',
-            'premium_economy': 'PREMIUM_ECONOMY',
-            'business': 'BUSINESS',
-            'first': 'FIRST'
-        }
-        return mapping.get(travel_class, 'ECONOMY')
-    
-    def _transform_flight_offer(self, offer: Any, search_params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return _TRAVEL_CLASS_MAP.get(travel_class, 'ECONOMY')
+    
+    def _transform_flight_offer(
+        self,
+        offer: Any,
+        origin: str,
+        destination: str,
+        departure_date: str,
+        adults: int,
+        travel_class: str
+    ) -> Optional[Dict[str, Any]]:
         """Transform Amadeus flight offer to our format."""
         try:
-            if not offer.get('itineraries') or not offer.get('price'):
+            itineraries = offer.get('itineraries')
+            price = offer.get('price')
+            if not itineraries or not price:
                 return None
             
-            itinerary = offer['itineraries'][0]
-            segments = itinerary.get('segments', [])
+            itinerary = itineraries[0]
+            segments = itinerary.get('segments')
             
             if not segments:
                 return None
             
             first_segment = segments[0]
             last_segment = segments[-1]
+            departure = first_segment.get('departure') or _EMPTY
+            arrival = last_segment.get('arrival') or _EMPTY
+            aircraft = first_segment.get('aircraft') or _EMPTY
             
-            # Calculate total duration
-            duration = itinerary.get('duration', 'PT0H0M')
-            duration_formatted = self._format_duration(duration)
-            
-            # Get airline info
             airline_code = first_segment.get('carrierCode', 'XX')
-            airline_name = self._get_airline_name(airline_code)
-            
-            # Get aircraft info
-            aircraft = first_segment.get('aircraft', {}).get('code', 'Unknown')
+            total = float(price['total'])
             
             return {
-                'airline': airline_name,
+                'airline': self._get_airline_name(airline_code),
                 'flight_number': f"{airline_code}{first_segment.get('number', '0000')}",
-                'origin': search_params['origin'],
-                'destination': search_params['destination'],
-                'departure_date': search_params['departure_date'],
-                'departure_time': self._format_time(first_segment.get('departure', {}).get('at', '')),
-                'arrival_time': self._format_time(last_segment.get('arrival', {}).get('at', '')),
-                'duration': duration_formatted,
+                'origin': origin,
+                'destination': destination,
+                'departure_date': departure_date,
+                'departure_time': self._format_time(departure.get('at', '')),
+                'arrival_time': self._format_time(arrival.get('at', '')),
+                'duration': self._format_duration(itinerary.get('duration', 'PT0H0M')),
                 'price': {
-                    'amount': float(offer['price']['total']),
-                    'currency': offer['price']['currency'],
-                    'per_person': float(offer['price']['total']) / search_params['adults']
+                    'amount': total,
+                    'currency': price['currency'],
+                    'per_person': total / adults
                 },
                 'stops': len(segments) - 1,
-                'travel_class': search_params['travel_class'],
-                'aircraft': aircraft,
+                'travel_class': travel_class,
+                'aircraft': aircraft.get('code', 'Unknown'),
                 'booking_class': first_segment.get('class', 'Y')
             }
             
@@ -160,47 +514,30 @@ class AmadeusFlightService:
     
     def _format_duration(self, duration_str: str) -> str:
         """Format ISO 8601 duration to readable format."""
-        try:
-            # Parse PT2H30M format
-            duration_str = duration_str.replace('PT', '')
-            hours = 0
-            minutes = 0
-            
-            if 'H' in duration_str:
-                hours_part, remainder = duration_str.split('H')
-                hours = int(hours_part)
-                duration_str = remainder
-            
-            if 'M' in duration_str:
-                minutes_part = duration_str.replace('M', '')
-                if minutes_part:
-                    minutes = int(minutes_part)
-            
-            return f"{hours}h {minutes}m"
-        except:
+        # Parse PT2H30M format
+        match = _DURATION_RE.match(duration_str) if duration_str else None
+        if not match:
             return "Unknown duration"
+        hours, minutes = match.groups(default="0")
+        return f"{int(hours)}h {int(minutes)}m"
     
     def _format_time(self, datetime_str: str) -> str:
         """Extract time from datetime string."""
-        try:
-            if 'T' in datetime_str:
-                return datetime_str.split('T')[1][:5]  # Get HH:MM
-            return datetime_str[:5] if len(datetime_str) >= 5 else "00:00"
-        except:
+        if not isinstance(datetime_str, str):
             return "00:00"
+        # Amadeus timestamps are YYYY-MM-DDTHH:MM:SS, so HH:MM sits at [11:16]
+        if len(datetime_str) >= 16 and datetime_str[10] == 'T':
+            return datetime_str[11:16]
+        if 'T' in datetime_str:
+            return datetime_str.partition('T')[2][:5]
+        return datetime_str[:5] if len(datetime_str) >= 5 else "00:00"
     
     def _get_airline_name(self, airline_code: str) -> str:
         """Get airline name from code."""
-        airlines = {
-            'AA': 'American Airlines',
-            'DL': 'Delta Air Lines',
-            'UA': 'United Airlines',
-            'WN': 'Southwest Airlines',
-            'B6': 'JetBlue Airways',
-            'LH': 'Lufthansa',
-            'BA': 'British Airways',
-            'AF': 'Air France',
-            'KL': 'KLM',
-            'LX': 'Swiss International Air Lines'
-        }
-        return airlines.get(airline_code, f"Airline {airline_code}")
\ No newline at end of file
+        return _AIRLINE_NAMES.get(airline_code, f"Airline {airline_code}")
+
+
+@functools.cache
+def get_service() -> AmadeusFlightService:
+    """Return the process-wide AmadeusFlightService, creating it on first use."""
+    return AmadeusFlightService()
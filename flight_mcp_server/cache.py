@@ -0,0 +1,102 @@
+"""In-process TTL cache for flight MCP server."""
+
+import asyncio
+import copy
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_MISSING = object()
+
+
+class TTLCache:
+    """Bounded LRU cache with optional expiry and single-flight async misses."""
+
+    __slots__ = ("maxsize", "ttl", "_entries", "_pending")
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """Create a cache holding at most ``maxsize`` entries for ``ttl`` seconds."""
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._pending: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._lookup(key) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a copy of the cached value for key, or default if absent/expired."""
+        value = self._lookup(key)
+        if value is _MISSING:
+            return default
+        return copy.deepcopy(value)
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a private copy of value under key, evicting the oldest entries."""
+        self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+    async def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]] = None,
+    ) -> Any:
+        """Return the cached value for key, awaiting fetch() once on a miss.
+
+        Concurrent misses for the same key share a single fetch, which runs as
+        its own task so cancelling one caller does not cancel the others.
+        Failures are propagated to every waiter and never cached.
+        """
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return copy.deepcopy(value)
+
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._fetch_and_store(key, fetch, should_cache))
+            pending.add_done_callback(_retrieve_exception)
+            self._pending[key] = pending
+        return copy.deepcopy(await asyncio.shield(pending))
+
+    async def _fetch_and_store(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[Any]],
+        should_cache: Optional[Callable[[Any], bool]],
+    ) -> Any:
+        """Run fetch() for a miss and store the result if it should be cached."""
+        try:
+            value = await fetch()
+            if should_cache is None or should_cache(value):
+                self.set(key, value)
+            return value
+        finally:
+            del self._pending[key]
+
+    def _lookup(self, key: Hashable) -> Any:
+        """Return the stored value for key or _MISSING, dropping stale entries."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at >= self.ttl:
+            del self._entries[key]
+            return _MISSING
+        self._entries.move_to_end(key)
+        return value
+
+
+def _retrieve_exception(task: "asyncio.Future[Any]") -> None:
+    """Mark a fetch failure as retrieved even if every waiter was cancelled."""
+    if not task.cancelled():
+        task.exception()
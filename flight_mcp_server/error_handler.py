@@ -1,9 +1,17 @@
 """Error handling and validation for flight MCP server."""
 
 import re
-from datetime import datetime, date
+from datetime import date
 from typing import Any, Optional
 
+# ASCII digits only and \Z rather than $, which would also accept a trailing newline
+_DATE_RE = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}\Z')
+# Flight number should be airline code (2-3 letters) + number
+_FLIGHT_NUMBER_RE = re.compile(r'^[A-Z]{2,3}\d{1,4}$')
+
+_TRAVEL_CLASSES = ("economy", "premium_economy", "business", "first")
+_VALID_TRAVEL_CLASSES = frozenset(_TRAVEL_CLASSES)
+
 
 class FlightAPIError(Exception):
     """Custom exception for flight API errors."""
@@ -20,31 +28,36 @@ def validate_airport_code(code: Any) -> str:
     if not code or not isinstance(code, str):
         raise ValidationError("Airport code is required and must be a string")
     
-    code = code.strip().upper()
+    code = code.strip()
     
-    if not code.isalpha() or len(code) != 3:
+    # Check length first; isascii keeps non-Latin letters out of isalpha
+    if len(code) != 3 or not code.isascii() or not code.isalpha():
         raise ValidationError("Airport code must be exactly 3 letters (e.g., LAX, JFK, LHR)")
     
-    return code
+    return code.upper()
+
 
+def validate_date(date_str: Any, field_name: str = "date", today: Optional[date] = None) -> str:
+    """Validate date format (YYYY-MM-DD).
 
-def validate_date(date_str: Any, field_name: str = "date") -> str:
-    """Validate date format (YYYY-MM-DD)."""
+    Pass ``today`` to reuse one reference date across several validations.
+    """
     if not date_str or not isinstance(date_str, str):
         raise ValidationError(f"{field_name} is required and must be a string")
     
     # Check format with regex
-    if not re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
+    if not _DATE_RE.match(date_str):
         raise ValidationError(f"{field_name} must be in YYYY-MM-DD format")
     
-    # Validate actual date
+    # Validate actual date; the regex guarantees fixed field offsets
     try:
-        parsed_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        parsed_date = date(int(date_str[0:4]), int(date_str[5:7]), int(date_str[8:10]))
     except ValueError:
         raise ValidationError(f"Invalid {field_name}: {date_str}")
     
     # Check if date is not in the past (allow today)
-    today = date.today()
+    if today is None:
+        today = date.today()
     if parsed_date < today:
         raise ValidationError(f"{field_name} cannot be in the past")
     
@@ -77,10 +90,9 @@ def validate_travel_class(travel_class: Any) -> str:
         raise ValidationError("Travel class must be a string")
     
     travel_class = travel_class.lower().strip()
-    valid_classes = ["economy", "premium_economy", "business", "first"]
     
-    if travel_class not in valid_classes:
-        raise ValidationError(f"Travel class must be one of: {', '.join(valid_classes)}")
+    if travel_class not in _VALID_TRAVEL_CLASSES:
+        raise ValidationError(f"Travel class must be one of: {', '.join(_TRAVEL_CLASSES)}")
     
     return travel_class
 
@@ -92,8 +104,7 @@ def validate_flight_number(flight_number: Any) -> str:
     
     flight_number = flight_number.strip().upper()
     
-    # Flight number should be airline code (2-3 letters) + number
-    if not re.match(r'^[A-Z]{2,3}\d{1,4}$', flight_number):
+    if not _FLIGHT_NUMBER_RE.match(flight_number):
         raise ValidationError("Flight number must be in format like AA123, DL456, etc.")
     
     return flight_number
@@ -104,9 +115,9 @@ def validate_airline_code(airline_code: Any) -> str:
     if not airline_code or not isinstance(airline_code, str):
         raise ValidationError("Airline code is required and must be a string")
     
-    airline_code = airline_code.strip().upper()
+    airline_code = airline_code.strip()
     
-    if not airline_code.isalpha() or len(airline_code) not in [2, 3]:
+    if len(airline_code) not in (2, 3) or not airline_code.isascii() or not airline_code.isalpha():
         raise ValidationError("Airline code must be 2-3 letters (e.g., AA, DL, UA)")
     
-    return airline_code
\ No newline at end of file
+    return airline_code.upper()
\ No newline at end of file
@@ -2,14 +2,20 @@
 """Flight MCP Server - Main server implementation."""
 
 import asyncio
+import functools
 import logging
+import random
+import re
+from datetime import date
+from operator import itemgetter
+from types import MappingProxyType
 from typing import Any, Sequence
 
 import mcp.server.stdio
 from mcp import server, types
 from mcp.server import NotificationOptions, Server
 
-from .amadeus_client import AmadeusFlightService
+from .amadeus_client import get_service
 from .error_handler import (
     FlightAPIError,
     ValidationError,
@@ -24,6 +30,179 @@ from .error_handler import (
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+_AIRLINE_CODE_RE = re.compile(r"^[A-Za-z]{2,3}\Z")
+
+_TextContent = types.TextContent
+
+
+def _text_result(text: str) -> list[types.TextContent]:
+    """Wrap text as a single MCP text content result."""
+    return [_TextContent(type="text", text=text)]
+
+
+# Shared stand-in for missing tool arguments; handlers only read from it
+_EMPTY_ARGS: dict[str, Any] = {}
+
+# Mock data served when the Amadeus API is not configured
+MOCK_AIRPORTS = MappingProxyType({
+    "LAX": {
+        "code": "LAX",
+        "name": "Los Angeles International Airport",
+        "city": "Los Angeles",
+        "country": "United States",
+        "timezone": "America/Los_Angeles",
+        "coordinates": {"lat": 33.9425, "lon": -118.4081},
+    },
+    "JFK": {
+        "code": "JFK",
+        "name": "John F. Kennedy International Airport",
+        "city": "New York",
+        "country": "United States",
+        "timezone": "America/New_York",
+        "coordinates": {"lat": 40.6413, "lon": -73.7781},
+    },
+    "LHR": {
+        "code": "LHR",
+        "name": "London Heathrow Airport",
+        "city": "London",
+        "country": "United Kingdom",
+        "timezone": "Europe/London",
+        "coordinates": {"lat": 51.4700, "lon": -0.4543},
+    },
+    "NRT": {
+        "code": "NRT",
+        "name": "Narita International Airport",
+        "city": "Tokyo",
+        "country": "Japan",
+        "timezone": "Asia/Tokyo",
+        "coordinates": {"lat": 35.7719, "lon": 140.3928},
+    },
+})
+
+
+def _format_airport(airport: dict[str, Any]) -> str:
+    """Format airport details, without the data source line."""
+    return (
+        f"Airport Information\\n\\n"
+        f"Code: {airport['code']}\\n"
+        f"Name: {airport['name']}\\n"
+        f"City: {airport['city']}\\n"
+        f"Country: {airport['country']}\\n"
+        f"Timezone: {airport['timezone']}\\n"
+        f"Coordinates: {airport['coordinates']['lat']}, {airport['coordinates']['lon']}"
+    )
+
+
+MOCK_AIRPORT_TEXT = MappingProxyType({
+    code: _format_airport(airport) for code, airport in MOCK_AIRPORTS.items()
+})
+
+MOCK_AIRLINES = MappingProxyType({
+    "AA": {
+        "name": "American Airlines",
+        "country": "United States",
+        "founded": 1930,
+        "hub": "Dallas/Fort Worth International Airport",
+        "fleet_size": "850+",
+        "destinations": "350+",
+    },
+    "DL": {
+        "name": "Delta Air Lines",
+        "country": "United States", 
+        "founded": 1924,
+        "hub": "Hartsfield-Jackson Atlanta International Airport",
+        "fleet_size": "800+",
+        "destinations": "325+",
+    },
+    "UA": {
+        "name": "United Airlines",
+        "country": "United States",
+        "founded": 1926,
+        "hub": "Chicago O'Hare International Airport",
+        "fleet_size": "800+",
+        "destinations": "340+",
+    },
+    "LH": {
+        "name": "Lufthansa",
+        "country": "Germany",
+        "founded": 1953,
+        "hub": "Frankfurt Airport",
+        "fleet_size": "300+",
+        "destinations": "220+",
+    },
+})
+
+MOCK_AIRLINE_TEXT = MappingProxyType({
+    code: (
+        f"Airline Information\\n\\n"
+        f"Code: {code}\\n"
+        f"Name: {airline['name']}\\n"
+        f"Country: {airline['country']}\\n"
+        f"Founded: {airline['founded']}\\n"
+        f"Main Hub: {airline['hub']}\\n"
+        f"Fleet Size: {airline['fleet_size']}\\n"
+        f"Destinations: {airline['destinations']}"
+    )
+    for code, airline in MOCK_AIRLINES.items()
+})
+
+MOCK_FLIGHT_AIRLINES = (
+    {"code": "AA", "name": "American Airlines"},
+    {"code": "DL", "name": "Delta Air Lines"},
+    {"code": "UA", "name": "United Airlines"},
+    {"code": "WN", "name": "Southwest Airlines"},
+    {"code": "B6", "name": "JetBlue Airways"},
+)
+
+FLIGHT_STATUSES = ("On Time", "Delayed", "Boarding", "Departed", "Arrived", "Cancelled")
+GATES = ("A12", "B7", "C14", "D9", "E23")
+
+# Status-specific lines of the flight status text, filled in with the gate
+_BOARDING_INFO = "Gate: {gate}\\nScheduled Departure: 14:30\\n"
+STATUS_TEMPLATES = MappingProxyType({
+    "On Time": _BOARDING_INFO,
+    "Delayed": _BOARDING_INFO + "Estimated Departure: 15:15\\nDelay Reason: Weather conditions\\n",
+    "Boarding": _BOARDING_INFO,
+    "Departed": _BOARDING_INFO + "Actual Time: 14:35\\n",
+    "Arrived": _BOARDING_INFO + "Actual Time: 14:35\\n",
+    "Cancelled": "Flight has been cancelled. Please contact your airline for rebooking options.\\n",
+})
+
+# Every (status, gate) combination, so one draw picks both uniformly
+STATUS_GATE_PAIRS = tuple((status, gate) for status in FLIGHT_STATUSES for gate in GATES)
+
+
+@functools.lru_cache(maxsize=256)
+def _mock_flight_template(origin, destination, departure_date, adults, travel_class):
+    """Draw the random part of a mock search once per distinct query.
+
+    Returns (airline, flight number, departure, arrival, duration,
+    per-person price, stops) tuples sorted by price.
+    """
+    # Draw all airlines in one call and bind the RNG helpers locally
+    randint = random.randint
+    rand = random.random
+    
+    flights = []
+    for airline in random.choices(MOCK_FLIGHT_AIRLINES, k=5):
+        flight_number = f"{airline['code']}{randint(1000, 9999)}"
+        base_price = randint(200, 800)
+        duration_hours = randint(2, 10)
+        duration_minutes = randint(0, 59)
+        
+        flights.append((
+            airline["name"],
+            flight_number,
+            f"{randint(6, 22):02d}:{randint(0, 59):02d}",
+            f"{randint(8, 23):02d}:{randint(0, 59):02d}",
+            f"{duration_hours}h {duration_minutes}m",
+            base_price,
+            0 if rand() > 0.4 else 1,
+        ))
+    
+    # Total price is per-person price times a fixed head count, so same order
+    return tuple(sorted(flights, key=itemgetter(5)))
+
 
 class FlightMCPServer:
     """Flight MCP Server implementation."""
@@ -36,106 +215,118 @@ class FlightMCPServer:
         
         # Initialize Amadeus service
         try:
-            self.amadeus_service = AmadeusFlightService()
+            self.amadeus_service = get_service()
             logger.info("Amadeus API client initialized")
             # Test connection will be done when first request comes in
         except Exception as error:
             logger.warning(f"Amadeus API initialization failed, using mock data: {error}")
             self.use_real_api = False
         
+        # Tool schemas are static, so build them once and reuse for every listTools
+        self._tools_cache = self._build_tools()
+        self._tool_dispatch = {
+            "search_flights": self._search_flights,
+            "get_airport_info": self._get_airport_info,
+            "get_flight_status": self._get_flight_status,
+            "get_airline_info": self._get_airline_info,
+        }
         self._setup_handlers()
     
-    def _setup_handlers(self):
-        """Set up MCP message handlers."""
-        
-        @self.server.list_tools()
-        async def handle_list_tools() -> list[types.Tool]:
-            """List available tools."""
-            return [
-                types.Tool(
-                    name="search_flights",
-                    description="Search for flights between two airports",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "origin": {
-                                "type": "string",
-                                "description": "Origin airport code (IATA 3-letter code, e.g., NYC, LAX)",
-                            },
-                            "destination": {
-                                "type": "string", 
-                                "description": "Destination airport code (IATA 3-letter code, e.g., NYC, LAX)",
-                            },
-                            "departure_date": {
-                                "type": "string",
-                                "description": "Departure date in YYYY-MM-DD format",
-                            },
-                            "return_date": {
-                                "type": "string",
-                                "description": "Return date in YYYY-MM-DD format (optional for one-way flights)",
-                            },
-                            "adults": {
-                                "type": "integer",
-                                "description": "Number of adult passengers (default: 1)",
-                                "minimum": 1,
-                                "maximum": 9,
-                            },
-                            "travel_class": {
-                                "type": "string",
-                                "description": "Travel class preference",
-                                "enum": ["economy", "premium_economy", "business", "first"],
-                            },
+    def _build_tools(self) -> list[types.Tool]:
+        """Build the tool definitions exposed by this server."""
+        return [
+            types.Tool(
+                name="search_flights",
+                description="Search for flights between two airports",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "origin": {
+                            "type": "string",
+                            "description": "Origin airport code (IATA 3-letter code, e.g., NYC, LAX)",
+                        },
+                        "destination": {
+                            "type": "string", 
+                            "description": "Destination airport code (IATA 3-letter code, e.g., NYC, LAX)",
+                        },
+                        "departure_date": {
+                            "type": "string",
+                            "description": "Departure date in YYYY-MM-DD format",
+                        },
+                        "return_date": {
+                            "type": "string",
+                            "description": "Return date in YYYY-MM-DD format (optional for one-way flights)",
+                        },
+                        "adults": {
+                            "type": "integer",
+                            "description": "Number of adult passengers (default: 1)",
+                            "minimum": 1,
+                            "maximum": 9,
+                        },
+                        "travel_class": {
+                            "type": "string",
+                            "description": "Travel class preference",
+                            "enum": ["economy", "premium_economy", "business", "first"],
                         },
-                        "required": ["origin", "destination", "departure_date"],
                     },
-                ),
-                types.Tool(
-                    name="get_airport_info",
-                    description="Get information about an airport by its code",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "airport_code": {
-                                "type": "string",
-                                "description": "Airport IATA code (3-letter code, e.g., LAX, JFK)",
-                            },
+                    "required": ["origin", "destination", "departure_date"],
+                },
+            ),
+            types.Tool(
+                name="get_airport_info",
+                description="Get information about an airport by its code",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "airport_code": {
+                            "type": "string",
+                            "description": "Airport IATA code (3-letter code, e.g., LAX, JFK)",
                         },
-                        "required": ["airport_code"],
                     },
-                ),
-                types.Tool(
-                    name="get_flight_status",
-                    description="Get real-time status of a specific flight",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "flight_number": {
-                                "type": "string",
-                                "description": "Flight number (e.g., AA123, DL456)",
-                            },
-                            "date": {
-                                "type": "string",
-                                "description": "Flight date in YYYY-MM-DD format",
-                            },
+                    "required": ["airport_code"],
+                },
+            ),
+            types.Tool(
+                name="get_flight_status",
+                description="Get real-time status of a specific flight",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "flight_number": {
+                            "type": "string",
+                            "description": "Flight number (e.g., AA123, DL456)",
+                        },
+                        "date": {
+                            "type": "string",
+                            "description": "Flight date in YYYY-MM-DD format",
                         },
-                        "required": ["flight_number", "date"],
                     },
-                ),
-                types.Tool(
-                    name="get_airline_info",
-                    description="Get information about an airline",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "airline_code": {
-                                "type": "string",
-                                "description": "Airline IATA code (2-letter code, e.g., AA, DL, UA)",
-                            },
+                    "required": ["flight_number", "date"],
+                },
+            ),
+            types.Tool(
+                name="get_airline_info",
+                description="Get information about an airline",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "airline_code": {
+                            "type": "string",
+                            "description": "Airline IATA code (2-letter code, e.g., AA, DL, UA)",
                         },
-                        "required": ["airline_code"],
                     },
-                ),
-            ]
+                    "required": ["airline_code"],
+                },
+            ),
+        ]
+    
+    def _setup_handlers(self):
+        """Set up MCP message handlers."""
+        
+        @self.server.list_tools()
+        async def handle_list_tools() -> list[types.Tool]:
+            """List available tools."""
+            return self._tools_cache
         
         @self.server.call_tool()
         async def handle_call_tool(
@@ -143,61 +334,44 @@ class FlightMCPServer:
         ) -> list[types.TextContent]:
             """Handle tool calls."""
             try:
-                if name == "search_flights":
-                    return await self._search_flights(arguments or {})
-                elif name == "get_airport_info":
-                    return await self._get_airport_info(arguments or {})
-                elif name == "get_flight_status":
-                    return await self._get_flight_status(arguments or {})
-                elif name == "get_airline_info":
-                    return await self._get_airline_info(arguments or {})
-                else:
+                handler = self._tool_dispatch.get(name)
+                if handler is None:
                     raise FlightAPIError(f"Unknown tool: {name}")
+                return await handler(arguments if arguments is not None else _EMPTY_ARGS)
             except (ValidationError, FlightAPIError) as error:
-                return [types.TextContent(type="text", text=str(error))]
+                return _text_result(str(error))
             except Exception as error:
                 logger.error(f"Tool call error: {error}")
-                return [types.TextContent(
-                    type="text", 
-                    text=f"An unexpected error occurred: {error}"
-                )]
+                return _text_result(f"An unexpected error occurred: {error}")
     
     async def _search_flights(self, args: dict[str, Any]) -> list[types.TextContent]:
         """Search for flights."""
-        # Validate inputs
-        origin = validate_airport_code(args.get("origin"))
-        destination = validate_airport_code(args.get("destination"))
-        departure_date = validate_date(args.get("departure_date"), "departure_date")
-        adults = validate_passenger_count(args.get("adults", 1))
-        travel_class = validate_travel_class(args.get("travel_class", "economy"))
-        
-        return_date = None
-        if args.get("return_date"):
-            return_date = validate_date(args.get("return_date"), "return_date")
-            
-            # Check that return date is after departure date
-            from datetime import datetime
-            dep_date = datetime.strptime(departure_date, "%Y-%m-%d")
-            ret_date = datetime.strptime(return_date, "%Y-%m-%d")
-            if ret_date <= dep_date:
-                raise ValidationError("Return date must be after departure date")
+        token_task = None
+        service = self.amadeus_service
+        if self.use_real_api and service and service.token_needs_refresh():
+            # Start the OAuth token refresh now so it overlaps input validation
+            token_task = asyncio.create_task(service.ensure_token())
         
-        # Check that origin and destination are different
-        if origin == destination:
-            raise ValidationError("Origin and destination airports must be different")
+        try:
+            (origin, destination, departure_date, return_date,
+             adults, travel_class) = self._validate_search_args(args)
+        except BaseException:
+            if token_task is not None:
+                token_task.cancel()
+            raise
         
         try:
             flights = []
-            if self.use_real_api and self.amadeus_service:
+            if self.use_real_api and service:
                 # Use real Amadeus API
-                flights = await self.amadeus_service.search_flights({
-                    "origin": origin,
-                    "destination": destination,
-                    "departure_date": departure_date,
-                    "return_date": return_date,
-                    "adults": adults,
-                    "travel_class": travel_class
-                })
+                search_args = (origin, destination, departure_date, return_date, adults, travel_class)
+                if token_task is not None:
+                    if service.has_cached_search(*search_args):
+                        # Cached offers need no token, so don't wait for it
+                        token_task.cancel()
+                    else:
+                        await token_task
+                flights = await service.search_flights(*search_args)
             else:
                 # Use mock data
                 flights = self._generate_mock_flights(
@@ -211,13 +385,37 @@ class FlightMCPServer:
                 flights, origin, destination, departure_date, return_date
             )
             
-            return [types.TextContent(type="text", text=result_text)]
+            return _text_result(result_text)
             
         except Exception as error:
             if isinstance(error, (ValidationError, FlightAPIError)):
                 raise
             raise FlightAPIError("Failed to search for flights") from error
     
+    def _validate_search_args(self, args: dict[str, Any]) -> tuple:
+        """Validate and normalize search_flights arguments."""
+        origin = validate_airport_code(args.get("origin"))
+        destination = validate_airport_code(args.get("destination"))
+        today = date.today()
+        departure_date = validate_date(args.get("departure_date"), "departure_date", today)
+        adults = validate_passenger_count(args.get("adults", 1))
+        travel_class = validate_travel_class(args.get("travel_class", "economy"))
+        
+        return_date = None
+        if args.get("return_date"):
+            return_date = validate_date(args.get("return_date"), "return_date", today)
+            
+            # Check that return date is after departure date; validate_date only
+            # accepts zero-padded ASCII YYYY-MM-DD (see _DATE_RE), so string order is date order
+            if return_date <= departure_date:
+                raise ValidationError("Return date must be after departure date")
+        
+        # Check that origin and destination are different
+        if origin == destination:
+            raise ValidationError("Origin and destination airports must be different")
+        
+        return origin, destination, departure_date, return_date, adults, travel_class
+    
     async def _get_airport_info(self, args: dict[str, Any]) -> list[types.TextContent]:
         """Get airport information."""
         airport_code = validate_airport_code(args.get("airport_code"))
@@ -225,59 +423,16 @@ class FlightMCPServer:
         try:
             if self.use_real_api and self.amadeus_service:
                 airport = await self.amadeus_service.get_airport_info(airport_code)
+                airport_text = _format_airport(airport)
             else:
-                # Mock airport data
-                mock_airports = {
-                    "LAX": {
-                        "code": "LAX",
-                        "name": "Los Angeles International Airport",
-                        "city": "Los Angeles",
-                        "country": "United States",
-                        "timezone": "America/Los_Angeles",
-                        "coordinates": {"lat": 33.9425, "lon": -118.4081},
-                    },
-                    "JFK": {
-                        "code": "JFK",
-                        "name": "John F. Kennedy International Airport",
-                        "city": "New York",
-                        "country": "United States",
-                        "timezone": "America/New_York",
-                        "coordinates": {"lat": 40.6413, "lon": -73.7781},
-                    },
-                    "LHR": {
-                        "code": "LHR",
-                        "name": "London Heathrow Airport",
-                        "city": "London",
-                        "country": "United Kingdom",
-                        "timezone": "Europe/London",
-                        "coordinates": {"lat": 51.4700, "lon": -0.4543},
-                    },
-                    "NRT": {
-                        "code": "NRT",
-                        "name": "Narita International Airport",
-                        "city": "Tokyo",
-                        "country": "Japan",
-                        "timezone": "Asia/Tokyo",
-                        "coordinates": {"lat": 35.7719, "lon": 140.3928},
-                    },
-                }
-                
-                airport = mock_airports.get(airport_code)
-                if not airport:
+                airport_text = MOCK_AIRPORT_TEXT.get(airport_code)
+                if airport_text is None:
                     raise FlightAPIError(f"Airport information not found for code: {airport_code}")
             
-            result_text = (
-                f"Airport Information\\n\\n"
-                f"Code: {airport['code']}\\n"
-                f"Name: {airport['name']}\\n"
-                f"City: {airport['city']}\\n"
-                f"Country: {airport['country']}\\n"
-                f"Timezone: {airport['timezone']}\\n"
-                f"Coordinates: {airport['coordinates']['lat']}, {airport['coordinates']['lon']}\\n\\n"
-                f"{'Data from Amadeus API' if self.use_real_api else 'Sample data'}"
-            )
+            source = "\\n\\nData from Amadeus API" if self.use_real_api else "\\n\\nSample data"
+            result_text = airport_text + source
             
-            return [types.TextContent(type="text", text=result_text)]
+            return _text_result(result_text)
             
         except Exception as error:
             if isinstance(error, (ValidationError, FlightAPIError)):
@@ -290,162 +445,89 @@ class FlightMCPServer:
         date = validate_date(args.get("date"), "date")
         
         # Mock flight status
-        import random
-        statuses = ["On Time", "Delayed", "Boarding", "Departed", "Arrived", "Cancelled"]
-        status = random.choice(statuses)
-        gates = ["A12", "B7", "C14", "D9", "E23"]
-        gate = random.choice(gates)
+        status, gate = random.choice(STATUS_GATE_PAIRS)
         
         result_text = (
             f"Flight Status\\n\\n"
             f"Flight: {flight_number}\\n"
             f"Date: {date}\\n"
             f"Status: {status}\\n"
-        )
-        
-        if status != "Cancelled":
-            result_text += (
-                f"Gate: {gate}\\n"
-                f"Scheduled Departure: 14:30\\n"
-            )
-            if status == "Delayed":
-                result_text += "Estimated Departure: 15:15\\nDelay Reason: Weather conditions\\n"
-            elif status in ["Arrived", "Departed"]:
-                result_text += "Actual Time: 14:35\\n"
-        else:
-            result_text += "Flight has been cancelled. Please contact your airline for rebooking options.\\n"
+        ) + STATUS_TEMPLATES[status].format(gate=gate)
         
-        return [types.TextContent(type="text", text=result_text)]
+        return _text_result(result_text)
     
     async def _get_airline_info(self, args: dict[str, Any]) -> list[types.TextContent]:
         """Get airline information."""
-        airline_code = args.get("airline_code", "").upper()
+        airline_code = args.get("airline_code") or ""
         
-        if not airline_code or not airline_code.isalpha() or len(airline_code) not in [2, 3]:
+        if not isinstance(airline_code, str) or not _AIRLINE_CODE_RE.match(airline_code):
             raise ValidationError("Airline code must be 2-3 letters (e.g., AA, DL, UA)")
+        airline_code = airline_code.upper()
         
-        # Mock airline data
-        mock_airlines = {
-            "AA": {
-                "name": "American Airlines",
-                "country": "United States",
-                "founded": 1930,
-                "hub": "Dallas/Fort Worth International Airport",
-                "fleet_size": "850+",
-                "destinations": "350+",
-            },
-            "DL": {
-                "name": "Delta Air Lines",
-                "country": "United States", 
-                "founded": 1924,
-                "hub": "Hartsfield-Jackson Atlanta International Airport",
-                "fleet_size": "800+",
-                "destinations": "325+",
-            },
-            "UA": {
-                "name": "United Airlines",
-                "country": "United States",
-                "founded": 1926,
-                "hub": "Chicago O'Hare International Airport",
-                "fleet_size": "800+",
-                "destinations": "340+",
-            },
-            "LH": {
-                "name": "Lufthansa",
-                "country": "Germany",
-                "founded": 1953,
-                "hub": "Frankfurt Airport",
-                "fleet_size": "300+",
-                "destinations": "220+",
-            },
-        }
-        
-        airline = mock_airlines.get(airline_code)
-        if not airline:
+        result_text = MOCK_AIRLINE_TEXT.get(airline_code)
+        if result_text is None:
             raise FlightAPIError(f"Airline information not found for code: {airline_code}")
         
-        result_text = (
-            f"Airline Information\\n\\n"
-            f"Code: {airline_code}\\n"
-            f"Name: {airline['name']}\\n"
-            f"Country: {airline['country']}\\n"
-            f"Founded: {airline['founded']}\\n"
-            f"Main Hub: {airline['hub']}\\n"
-            f"Fleet Size: {airline['fleet_size']}\\n"
-            f"Destinations: {airline['destinations']}"
-        )
-        
-        return [types.TextContent(type="text", text=result_text)]
+        return _text_result(result_text)
     
     def _generate_mock_flights(self, origin, destination, departure_date, return_date, adults, travel_class):
         """Generate mock flight data."""
-        import random
-        
-        airlines = [
-            {"code": "AA", "name": "American Airlines"},
-            {"code": "DL", "name": "Delta Air Lines"},
-            {"code": "UA", "name": "United Airlines"},
-            {"code": "WN", "name": "Southwest Airlines"},
-            {"code": "B6", "name": "JetBlue Airways"},
-        ]
-        
-        flights = []
-        for i in range(5):
-            airline = random.choice(airlines)
-            flight_number = f"{airline['code']}{random.randint(1000, 9999)}"
-            base_price = random.randint(200, 800)
-            duration_hours = random.randint(2, 10)
-            duration_minutes = random.randint(0, 59)
-            
-            flights.append({
-                "airline": airline["name"],
+        return [
+            {
+                "airline": airline_name,
                 "flight_number": flight_number,
                 "origin": origin,
                 "destination": destination,
                 "departure_date": departure_date,
-                "departure_time": f"{random.randint(6, 22):02d}:{random.randint(0, 59):02d}",
-                "arrival_time": f"{random.randint(8, 23):02d}:{random.randint(0, 59):02d}",
-                "duration": f"{duration_hours}h {duration_minutes}m",
+                "departure_time": departure_time,
+                "arrival_time": arrival_time,
+                "duration": duration,
                 "price": {
                     "amount": base_price * adults,
                     "currency": "USD",
                     "per_person": base_price,
                 },
-                "stops": 0 if random.random() > 0.4 else 1,
+                "stops": stops,
                 "travel_class": travel_class,
                 "aircraft": "Boeing 737-800",
                 "booking_class": "V",
-            })
-        
-        return sorted(flights, key=lambda x: x["price"]["amount"])
+            }
+            for (airline_name, flight_number, departure_time, arrival_time,
+                 duration, base_price, stops) in _mock_flight_template(
+                origin, destination, departure_date, adults, travel_class
+            )
+        ]
     
     def _format_flight_results(self, flights, origin, destination, departure_date, return_date):
         """Format flight search results."""
-        result = f"Flight Search Results\\n"
-        result += f"Route: {origin} → {destination}\\n"
-        result += f"Departure Date: {departure_date}\\n"
+        parts = [
+            f"Flight Search Results\\n"
+            f"Route: {origin} → {destination}\\n"
+            f"Departure Date: {departure_date}\\n"
+        ]
         if return_date:
-            result += f"Return Date: {return_date}\\n"
+            parts.append(f"Return Date: {return_date}\\n")
         
         data_source = "Live data from Amadeus API" if self.use_real_api else "Sample data (configure API for real results)"
-        result += f"{data_source}\\n\\n"
+        parts.append(f"{data_source}\\n\\n")
         
         for i, flight in enumerate(flights, 1):
-            result += f"{i}. {flight['airline']} ({flight['flight_number']})\\n"
-            result += f"   Time: {flight['departure_time']} → {flight['arrival_time']} ({flight['duration']})\\n"
-            result += f"   Price: {flight['price']['currency']} {flight['price']['amount']} total ({flight['price']['currency']} {flight['price']['per_person']}/person)\\n"
-            result += f"   Aircraft: {flight.get('aircraft', 'Aircraft info unavailable')} | {'Direct' if flight['stops'] == 0 else str(flight['stops']) + ' stop(s)'}\\n"
-            result += f"   Class: {flight['travel_class']}"
-            
-            if flight.get('booking_class'):
-                result += f" ({flight['booking_class']})"
-            
-            result += "\\n\\n"
+            price = flight['price']
+            stops = 'Direct' if flight['stops'] == 0 else f"{flight['stops']} stop(s)"
+            booking_class = flight.get('booking_class')
+            class_suffix = f" ({booking_class})" if booking_class else ""
+            parts.append(
+                f"{i}. {flight['airline']} ({flight['flight_number']})\\n"
+                f"   Time: {flight['departure_time']} → {flight['arrival_time']} ({flight['duration']})\\n"
+                f"   Price: {price['currency']} {price['amount']} total ({price['currency']} {price['per_person']}/person)\\n"
+                f"   Aircraft: {flight.get('aircraft', 'Aircraft info unavailable')} | {stops}\\n"
+                f"   Class: {flight['travel_class']}{class_suffix}\\n\\n"
+            )
         
         if not self.use_real_api:
-            result += "Note: These are sample results. Real Amadeus API integration is available with valid credentials.\\n"
+            parts.append("Note: These are sample results. Real Amadeus API integration is available with valid credentials.\\n")
         
-        return result
+        return "".join(parts)
 
 
 async def main():
@@ -0,0 +1,219 @@
+"""Tests for the Amadeus client's circuit breaker and worker-pool calls."""
+
+import asyncio
+import socket
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from amadeus import AuthenticationError, NetworkError
+
+from flight_mcp_server import amadeus_client
+from flight_mcp_server.amadeus_client import AmadeusFlightService, _CircuitBreaker
+from flight_mcp_server.error_handler import FlightAPIError
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(amadeus_client.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = _CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    monkeypatch.setattr(amadeus_client, "_breaker", breaker)
+    return breaker
+
+
+@pytest.fixture
+def service(monkeypatch, breaker):
+    monkeypatch.setenv("AMADEUS_API_KEY", "key")
+    monkeypatch.setenv("AMADEUS_API_SECRET", "secret")
+    amadeus_client._settings.cache_clear()
+    yield AmadeusFlightService()
+    amadeus_client._settings.cache_clear()
+    _wait_for_idle_pool()
+
+
+def _wait_for_idle_pool():
+    """Block until calls abandoned by a timeout have left every worker."""
+    barrier = threading.Barrier(amadeus_client.MAX_CONCURRENT_CALLS)
+    jobs = [amadeus_client._pool.submit(barrier.wait) for _ in range(barrier.parties)]
+    for job in jobs:
+        job.result(timeout=5)
+
+
+def _network_error():
+    return NetworkError(SimpleNamespace(status_code=None, result=None, parsed=False))
+
+
+def _trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_breaker_opens_at_threshold(clock, breaker):
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.before_call()
+        breaker.record_failure()
+    breaker.before_call()  # still closed below the threshold
+    breaker.record_failure()
+
+    assert breaker.is_open
+    with pytest.raises(FlightAPIError, match="temporarily unavailable"):
+        breaker.before_call()
+
+
+def test_success_resets_failure_count(clock, breaker):
+    for _ in range(breaker.failure_threshold - 1):
+        breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert not breaker.is_open
+    breaker.before_call()
+
+
+def test_breaker_allows_a_single_probe_after_cool_down(clock, breaker):
+    _trip(breaker)
+    clock.now += breaker.reset_timeout - 1
+    with pytest.raises(FlightAPIError):
+        breaker.before_call()
+
+    clock.now += 1
+    breaker.before_call()  # the half-open probe
+    with pytest.raises(FlightAPIError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert not breaker.is_open
+    breaker.before_call()
+
+
+def test_failed_probe_reopens_the_circuit(clock, breaker):
+    _trip(breaker)
+    clock.now += breaker.reset_timeout
+    breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(FlightAPIError):
+        breaker.before_call()
+    clock.now += breaker.reset_timeout
+    breaker.before_call()
+
+
+def test_released_probe_lets_the_next_call_probe(clock, breaker):
+    _trip(breaker)
+    clock.now += breaker.reset_timeout
+    breaker.before_call()
+    breaker.release()
+
+    breaker.before_call()
+
+
+def test_outage_stops_reaching_upstream_once_open(monkeypatch, service, breaker):
+    calls = []
+
+    def failing_search(**params):
+        calls.append(params)
+        raise _network_error()
+
+    offers = SimpleNamespace(flight_offers_search=SimpleNamespace(get=failing_search))
+    monkeypatch.setattr(service.amadeus, "shopping", offers)
+
+    async def scenario():
+        errors = []
+        for _ in range(12):
+            try:
+                await service.search_flights("SFO", "JFK", "2099-01-05")
+            except Exception as error:
+                errors.append(error)
+        return errors
+
+    errors = asyncio.run(scenario())
+    assert len(errors) == 12
+    assert len(calls) == breaker.failure_threshold
+    assert breaker.is_open
+    assert isinstance(errors[-1], FlightAPIError)
+
+
+def test_cached_search_is_served_while_open(service, breaker):
+    service._search_cache.set(("LAX", "JFK", "2099-01-05", None, 1, "economy"), [{"price": 1}])
+    _trip(breaker)
+
+    assert asyncio.run(service.search_flights("LAX", "JFK", "2099-01-05")) == [{"price": 1}]
+
+
+def test_slow_call_counts_as_failure(monkeypatch, service, breaker):
+    monkeypatch.setattr(amadeus_client, "REQUEST_TIMEOUT", 0.05)
+
+    with pytest.raises(FlightAPIError, match="did not respond in time"):
+        asyncio.run(service._call(lambda: time.sleep(0.2)))
+    assert breaker._failures == 1
+
+
+def test_queue_time_does_not_count_as_failure(monkeypatch, service, breaker):
+    # Twice as many calls as workers: the second batch waits a full call in
+    # the queue, which together with its own run exceeds one timeout
+    monkeypatch.setattr(amadeus_client, "REQUEST_TIMEOUT", 0.3)
+    workers = amadeus_client.MAX_CONCURRENT_CALLS
+
+    def slow_call():
+        time.sleep(0.2)
+        return "ok"
+
+    async def scenario():
+        return await asyncio.gather(*(service._call(slow_call) for _ in range(2 * workers)))
+
+    assert asyncio.run(scenario()) == ["ok"] * (2 * workers)
+    assert breaker._failures == 0
+
+
+def test_call_expiring_in_queue_is_released(monkeypatch, service, breaker):
+    monkeypatch.setattr(amadeus_client, "REQUEST_TIMEOUT", 0.1)
+    workers = amadeus_client.MAX_CONCURRENT_CALLS
+
+    def slow_call():
+        time.sleep(0.15)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(service._call(slow_call) for _ in range(workers + 1)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    busy = [error for error in results if isinstance(error, FlightAPIError) and "busy" in str(error)]
+    assert len(busy) == 1
+    # The ones that ran timed out upstream; the queued one was not counted
+    assert breaker._failures == workers
+
+
+@pytest.mark.parametrize("error", [
+    AuthenticationError(SimpleNamespace(status_code=401, result=None, parsed=False)),
+    socket.timeout("timed out"),
+])
+def test_failed_token_refresh_is_left_to_the_next_call(monkeypatch, service, error):
+    token = service.amadeus.access_token
+
+    def failing_refresh():
+        raise error
+
+    monkeypatch.setattr(token, "access_token", None)
+    monkeypatch.setattr(token, "_bearer_token", failing_refresh)
+
+    asyncio.run(service.ensure_token())
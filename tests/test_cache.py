@@ -0,0 +1,159 @@
+"""Tests for the in-process TTL cache."""
+
+import asyncio
+
+import pytest
+
+from flight_mcp_server import cache as cache_module
+from flight_mcp_server.cache import TTLCache
+
+
+class _Clock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def _counting_fetch(value, delay=0.0):
+    """Return a fetch coroutine factory and a list recording its calls."""
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        if delay:
+            await asyncio.sleep(delay)
+        return value
+
+    return fetch, calls
+
+
+def test_hit_returns_cached_value_without_fetching():
+    async def scenario():
+        cache = TTLCache()
+        fetch, calls = _counting_fetch({"code": "LAX"})
+        first = await cache.get_or_fetch("LAX", fetch)
+        second = await cache.get_or_fetch("LAX", fetch)
+        return first, second, calls
+
+    first, second, calls = asyncio.run(scenario())
+    assert first == second == {"code": "LAX"}
+    assert len(calls) == 1
+
+
+def test_returned_values_are_copies():
+    async def scenario():
+        cache = TTLCache()
+        fetch, _ = _counting_fetch({"segments": [1]})
+        value = await cache.get_or_fetch("key", fetch)
+        value["segments"].append(2)
+        return await cache.get_or_fetch("key", fetch)
+
+    assert asyncio.run(scenario()) == {"segments": [1]}
+
+
+def test_entries_expire_after_ttl(clock):
+    async def scenario():
+        cache = TTLCache(ttl=120)
+        fetch, calls = _counting_fetch("offers")
+        await cache.get_or_fetch("key", fetch)
+        clock.now += 119
+        await cache.get_or_fetch("key", fetch)
+        fresh_calls = len(calls)
+        clock.now += 1
+        await cache.get_or_fetch("key", fetch)
+        return fresh_calls, len(calls), cache.get("missing", "default")
+
+    fresh_calls, total_calls, default = asyncio.run(scenario())
+    assert fresh_calls == 1
+    assert total_calls == 2
+    assert default == "default"
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest entry
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_concurrent_misses_share_one_fetch():
+    async def scenario():
+        cache = TTLCache()
+        fetch, calls = _counting_fetch("offers", delay=0.01)
+        results = await asyncio.gather(*(cache.get_or_fetch("key", fetch) for _ in range(10)))
+        return results, calls
+
+    results, calls = asyncio.run(scenario())
+    assert results == ["offers"] * 10
+    assert len(calls) == 1
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    async def scenario():
+        cache = TTLCache()
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise ValueError("upstream down")
+
+        results = await asyncio.gather(
+            *(cache.get_or_fetch("key", failing) for _ in range(3)),
+            return_exceptions=True,
+        )
+        fetch, _ = _counting_fetch("recovered")
+        recovered = await cache.get_or_fetch("key", fetch)
+        return results, calls, recovered
+
+    results, calls, recovered = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(calls) == 1
+    assert recovered == "recovered"
+
+
+def test_should_cache_rejects_values():
+    async def scenario():
+        cache = TTLCache()
+        fetch, calls = _counting_fetch([])
+        await cache.get_or_fetch("key", fetch, should_cache=bool)
+        await cache.get_or_fetch("key", fetch, should_cache=bool)
+        return calls
+
+    assert len(asyncio.run(scenario())) == 2
+
+
+def test_cancelling_one_caller_does_not_cancel_other_waiters():
+    async def scenario():
+        cache = TTLCache()
+        fetch, calls = _counting_fetch("offers", delay=0.05)
+        owner = asyncio.create_task(cache.get_or_fetch("key", fetch))
+        waiter = asyncio.create_task(cache.get_or_fetch("key", fetch))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        value = await waiter
+        return owner, waiter, value, calls, cache.get("key")
+
+    owner, waiter, value, calls, cached = asyncio.run(scenario())
+    assert owner.cancelled()
+    assert not waiter.cancelled()
+    assert value == "offers"
+    assert len(calls) == 1
+    assert cached == "offers"
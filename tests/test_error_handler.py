@@ -0,0 +1,45 @@
+"""Tests for input validation."""
+
+from datetime import date
+
+import pytest
+
+from flight_mcp_server.error_handler import ValidationError, validate_date
+
+TODAY = date(2027, 1, 1)
+
+
+def test_valid_date_is_returned_unchanged():
+    assert validate_date("2027-01-05", "departure_date", TODAY) == "2027-01-05"
+
+
+def test_today_is_allowed():
+    assert validate_date("2027-01-01", today=TODAY) == "2027-01-01"
+
+
+@pytest.mark.parametrize("value", [
+    "2027-01-05\n",
+    "２０２７-01-05",  # fullwidth digits
+    "2027-1-5",
+    "2027/01/05",
+    " 2027-01-05",
+])
+def test_malformed_dates_are_rejected(value):
+    with pytest.raises(ValidationError, match="YYYY-MM-DD"):
+        validate_date(value, "departure_date", TODAY)
+
+
+def test_impossible_date_is_rejected():
+    with pytest.raises(ValidationError, match="Invalid departure_date"):
+        validate_date("2027-02-30", "departure_date", TODAY)
+
+
+def test_past_date_is_rejected():
+    with pytest.raises(ValidationError, match="cannot be in the past"):
+        validate_date("2026-12-31", "departure_date", TODAY)
+
+
+@pytest.mark.parametrize("value", [None, "", 20270105])
+def test_missing_or_non_string_date_is_rejected(value):
+    with pytest.raises(ValidationError, match="is required"):
+        validate_date(value, "departure_date", TODAY)
@@ -0,0 +1,40 @@
+"""Tests for the flight MCP server's tool handlers."""
+
+import asyncio
+
+import pytest
+
+from flight_mcp_server.error_handler import ValidationError
+from flight_mcp_server.server import FlightMCPServer
+
+DEPARTURE = "2099-01-05"
+
+
+@pytest.fixture(scope="module")
+def server():
+    return FlightMCPServer()
+
+
+def _search(server, return_date):
+    return asyncio.run(server._search_flights({
+        "origin": "LAX",
+        "destination": "JFK",
+        "departure_date": DEPARTURE,
+        "return_date": return_date,
+    }))
+
+
+def test_later_return_date_is_accepted(server):
+    assert _search(server, "2099-01-12")
+
+
+@pytest.mark.parametrize("return_date", ["2099-01-05", "2099-01-01"])
+def test_same_day_or_earlier_return_date_is_rejected(server, return_date):
+    with pytest.raises(ValidationError, match="Return date must be after departure date"):
+        _search(server, return_date)
+
+
+@pytest.mark.parametrize("return_date", ["2099-01-05\n", "２０９９-01-01"])
+def test_malformed_return_date_is_rejected(server, return_date):
+    with pytest.raises(ValidationError, match="return_date must be in YYYY-MM-DD format"):
+        _search(server, return_date)